@@ -0,0 +1,76 @@
+# Copyright 2023 The KerasNLP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Optional fused CPU kernels for `keras_nlp.layers.RotaryEmbedding`.
+
+When running on the NumPy backend, applying a rotary embedding with plain
+ops takes several passes over the input (split, negate, concatenate,
+multiply, add), each allocating a full-sized buffer. The Numba kernel below
+applies the 2x2 rotation in a single pass, which matters because the
+computation is memory-bound.
+"""
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+if numba is not None:
+
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _rope_apply_half(tensor, cos, sin, out):
+        num_rows, rotary_dim = tensor.shape
+        half_dim = rotary_dim // 2
+        for row in numba.prange(num_rows):
+            for i in range(half_dim):
+                c = cos[row, i]
+                s = sin[row, i]
+                a = tensor[row, i]
+                b = tensor[row, half_dim + i]
+                out[row, i] = a * c - b * s
+                out[row, half_dim + i] = a * s + b * c
+
+
+def available():
+    """Check if the fused rotary embedding kernel can be used."""
+    return numba is not None
+
+
+def apply_rotary_pos_emb(tensor, cos_emb, sin_emb):
+    """Apply a "half" layout rotary embedding in a single fused pass.
+
+    Args:
+        tensor: numpy array, the input, with the feature axis last.
+        cos_emb: numpy array, cosine embedding, broadcastable to `tensor`.
+        sin_emb: numpy array, sine embedding, broadcastable to `tensor`.
+    """
+    tensor = np.ascontiguousarray(tensor)
+    rotary_dim = tensor.shape[-1]
+    half_dim = rotary_dim // 2
+    table_shape = tensor.shape[:-1] + (half_dim,)
+    # The cos/sin embeddings hold two identical halves along the feature
+    # axis, so only the first half is needed.
+    cos = np.ascontiguousarray(
+        np.broadcast_to(cos_emb[..., :half_dim], table_shape)
+    )
+    sin = np.ascontiguousarray(
+        np.broadcast_to(sin_emb[..., :half_dim], table_shape)
+    )
+    flat = tensor.reshape(-1, rotary_dim)
+    out = np.empty_like(flat)
+    _rope_apply_half(
+        flat, cos.reshape(-1, half_dim), sin.reshape(-1, half_dim), out
+    )
+    return out.reshape(tensor.shape)
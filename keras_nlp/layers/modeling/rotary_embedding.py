@@ -11,9 +11,29 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import weakref
+
 from keras_nlp.api_export import keras_nlp_export
+from keras_nlp.backend import config
 from keras_nlp.backend import keras
 from keras_nlp.backend import ops
+from keras_nlp.layers.modeling import _rope_kernels
+
+
+class _RotaryTables:
+    """Container for rotary tables shared across layer instances."""
+
+    def __init__(self, inverse_freq, cos_cache, sin_cache):
+        self.inverse_freq = inverse_freq
+        self.cos_cache = cos_cache
+        self.sin_cache = sin_cache
+
+
+# Layers with an identical configuration produce identical tables, so all of
+# them (e.g. one rotary embedding per transformer layer in a backbone) share
+# a single set instead of each building its own copy. The cache holds weak
+# references; entries are evicted once no layer uses the tables anymore.
+_ROTARY_TABLE_CACHE = {}
 
 
 @keras_nlp_export("keras_nlp.layers.RotaryEmbedding")
@@ -37,6 +57,25 @@ class RotaryEmbedding(keras.layers.Layer):
         scaling_factor: float. The scaling factor used to scale frequency range.
         sequence_axis: int. Sequence axis in the input tensor.
         feature_axis: int. Feature axis in the input tensor.
+        max_sequence_length: int. If set, cosine and sine tables for all
+            positions up to `max_sequence_length` are computed once when the
+            layer is built, and each call only slices the tables to the input
+            sequence length. This avoids recomputing the rotation tables on
+            every forward pass, which can meaningfully speed up iterative
+            decoding. Inputs with a longer sequence than
+            `max_sequence_length` raise an error. Defaults to `None`.
+        pair_layout: str. Either `"half"`, which rotates feature `i` with
+            feature `i + feature_dim / 2`, or `"interleave"`, which rotates
+            adjacent features `2 * i` and `2 * i + 1`. The interleaved
+            layout reads feature pairs from contiguous memory, which maps
+            better onto SIMD loads on CPU backends, and requires the feature
+            axis to be the last axis. Defaults to `"half"`.
+        jit_compile: bool. If `True`, on the TensorFlow backend, eagerly
+            executed calls are dispatched to an XLA compiled function that
+            fuses the rotary computation into a single kernel. XLA compiles
+            one executable per concrete input shape, so only enable this for
+            workloads with a fixed (or bucketed) sequence length. Defaults
+            to `False`.
 
     Examples:
 
@@ -66,51 +105,252 @@ class RotaryEmbedding(keras.layers.Layer):
         scaling_factor=1.0,
         sequence_axis=1,
         feature_axis=-1,
-        **kwargs
+        max_sequence_length=None,
+        pair_layout="half",
+        jit_compile=False,
+        **kwargs,
     ):
         super().__init__(**kwargs)
+        if pair_layout not in ("half", "interleave"):
+            raise ValueError(
+                '`pair_layout` must be either `"half"` or `"interleave"`. '
+                f"Received: pair_layout={pair_layout}"
+            )
+        self.pair_layout = pair_layout
         self.max_wavelength = max_wavelength
         self.sequence_axis = sequence_axis
         self.feature_axis = feature_axis
         self.scaling_factor = scaling_factor
+        self.max_sequence_length = max_sequence_length
+        self.jit_compile = jit_compile
+        self.inverse_freq = None
+        self.cos_cache = None
+        self.sin_cache = None
+        self._tables = None
+        self._jit_rotary_fn = None
+        self._rank = None
+        self._sequence_axis = None
+        self._feature_axis = None
+
+    def build(self, input_shape):
+        # Resolve the input rank and axes up front, so the hot path needs no
+        # Python-level axis normalization per call.
+        self._resolve_axes(len(input_shape))
+        rotary_dim = input_shape[self._feature_axis]
+        # If the feature size is not known ahead of time, fall back to
+        # computing the rotation tables on the fly in `call`.
+        if rotary_dim is not None:
+            tables = self._get_shared_tables(rotary_dim)
+            self.inverse_freq = tables.inverse_freq
+            self.cos_cache = tables.cos_cache
+            self.sin_cache = tables.sin_cache
+        if self.jit_compile and config.backend() == "tensorflow":
+            import tensorflow as tf
+
+            # The rotary computation is a chain of small elementwise and
+            # broadcast ops; a single XLA cluster fuses them into one kernel
+            # rather than one launch per op.
+            self._jit_rotary_fn = tf.function(
+                self._rotate, jit_compile=True, reduce_retracing=True
+            )
+        super().build(input_shape)
+
+    def _resolve_axes(self, rank):
+        self._rank = rank
+        self._sequence_axis = (
+            self.sequence_axis
+            if self.sequence_axis >= 0
+            else rank + self.sequence_axis
+        )
+        self._feature_axis = (
+            self.feature_axis
+            if self.feature_axis >= 0
+            else rank + self.feature_axis
+        )
 
     def call(self, inputs):
+        if self._jit_rotary_fn is not None:
+            import tensorflow as tf
+
+            # Inside an outer tf.function the caller controls compilation;
+            # only dispatch to the pre-compiled function from eager code.
+            if tf.executing_eagerly():
+                return self._jit_rotary_fn(inputs)
+        return self._rotate(inputs)
+
+    def _rotate(self, inputs):
+        if len(inputs.shape) != self._rank:
+            # One instance may see inputs of different ranks, e.g. with and
+            # without a heads axis; re-resolve the axes when the rank changes.
+            self._resolve_axes(len(inputs.shape))
         rotary_dim = ops.shape(inputs)[-1]
+        if (
+            self._rank == 4
+            and self._sequence_axis == 1
+            and self._feature_axis == 3
+        ):
+            # The `(batch, sequence, heads, feature)` layout covers nearly
+            # all uses, so it gets a closed-form path with the rank and
+            # broadcast shape known statically.
+            return self._rotate_bshd(inputs, rotary_dim)
         cos_emb, sin_emb = self._compute_cos_sin_embedding(inputs, rotary_dim)
         return self._apply_rotary_pos_emb(inputs, cos_emb, sin_emb)
 
+    def _rotate_bshd(self, inputs, rotary_dim):
+        seq_len = ops.shape(inputs)[1]
+        cos_emb, sin_emb = self._compute_cos_sin_tables(
+            inputs, seq_len, rotary_dim
+        )
+        cos_emb = ops.reshape(cos_emb, (1, seq_len, 1, rotary_dim))
+        sin_emb = ops.reshape(sin_emb, (1, seq_len, 1, rotary_dim))
+        return self._apply_rotary_pos_emb(inputs, cos_emb, sin_emb)
+
+    def _get_shared_tables(self, rotary_dim):
+        cache_key = (
+            rotary_dim,
+            self.max_wavelength,
+            self.scaling_factor,
+            self.max_sequence_length,
+            self.pair_layout,
+            self.compute_dtype,
+        )
+        reference = _ROTARY_TABLE_CACHE.get(cache_key)
+        tables = reference() if reference is not None else None
+        if tables is None:
+            tables = self._build_tables(rotary_dim)
+
+            def evict(reference, cache_key=cache_key):
+                if _ROTARY_TABLE_CACHE.get(cache_key) is reference:
+                    del _ROTARY_TABLE_CACHE[cache_key]
+
+            _ROTARY_TABLE_CACHE[cache_key] = weakref.ref(tables, evict)
+        # Hold a strong reference, so the cache entry stays alive as long as
+        # any layer still uses these tables.
+        self._tables = tables
+        return tables
+
+    def _build_tables(self, rotary_dim):
+        inverse_freq = self._get_inverse_freq(rotary_dim)
+        cos_cache = None
+        sin_cache = None
+        if self.max_sequence_length is not None:
+            positions = ops.arange(self.max_sequence_length, dtype="float32")
+            positions = ops.cast(positions, inverse_freq.dtype)
+            freq = ops.expand_dims(positions, -1) * ops.expand_dims(
+                inverse_freq, 0
+            )
+            embedding = self._duplicate_freq(freq)
+            cos_cache = ops.cos(embedding)
+            sin_cache = ops.sin(embedding)
+            # cos/sin values are bounded in [-1, 1] and applying them is
+            # memory bound, so storing the tables in bfloat16 halves the
+            # bandwidth needed to read them. Half precision policies
+            # already store the tables in their own compute dtype.
+            if self.compute_dtype == "float32":
+                cos_cache = ops.cast(cos_cache, "bfloat16")
+                sin_cache = ops.cast(sin_cache, "bfloat16")
+        return _RotaryTables(inverse_freq, cos_cache, sin_cache)
+
+    def _duplicate_freq(self, freq):
+        if self.pair_layout == "interleave":
+            return ops.repeat(freq, 2, axis=-1)
+        return ops.concatenate((freq, freq), axis=-1)
+
     def _apply_rotary_pos_emb(self, tensor, cos_emb, sin_emb):
+        if self.pair_layout == "interleave":
+            return self._apply_interleave_rotary_pos_emb(
+                tensor, cos_emb, sin_emb
+            )
+        if (
+            config.backend() == "numpy"
+            and _rope_kernels.available()
+            and self._feature_axis == self._rank - 1
+        ):
+            # On the NumPy backend, a fused Numba kernel applies the rotation
+            # in one pass over memory instead of several op-by-op passes.
+            return _rope_kernels.apply_rotary_pos_emb(tensor, cos_emb, sin_emb)
         x1, x2 = ops.split(tensor, 2, axis=self.feature_axis)
-        half_rot_tensor = ops.concatenate((-x2, x1), axis=self.feature_axis)
-        return (tensor * cos_emb) + (half_rot_tensor * sin_emb)
-
-    def _compute_cos_sin_embedding(self, x, rotary_dim):
-        freq_range = ops.arange(0, rotary_dim, 2, dtype="float32")
-        freq_range = ops.cast(freq_range, self.compute_dtype)
-        freq_range = freq_range / ops.cast(
-            self.scaling_factor, self.compute_dtype
+        # The cos/sin embeddings hold two identical halves along the feature
+        # axis, so splitting them is free. Applying the rotation pairwise
+        # avoids materializing the negated-and-rotated copy of the input and
+        # the full-width multiply-add over it.
+        cos1, cos2 = ops.split(cos_emb, 2, axis=self.feature_axis)
+        sin1, sin2 = ops.split(sin_emb, 2, axis=self.feature_axis)
+        return ops.concatenate(
+            (x1 * cos1 - x2 * sin1, x2 * cos2 + x1 * sin2),
+            axis=self.feature_axis,
         )
-        inverse_freq = 1.0 / (
-            self.max_wavelength
-            ** (freq_range / ops.cast(rotary_dim, self.compute_dtype))
+
+    def _apply_interleave_rotary_pos_emb(self, tensor, cos_emb, sin_emb):
+        if self._feature_axis != self._rank - 1:
+            raise ValueError(
+                '`pair_layout="interleave"` requires the feature axis to be '
+                f"the last axis. Received: feature_axis={self.feature_axis}"
+            )
+        even = tensor[..., 0::2]
+        odd = tensor[..., 1::2]
+        # Adjacent features share the same rotation angle, so a single
+        # strided slice of the cos/sin embeddings covers both pair members.
+        cos = cos_emb[..., 0::2]
+        sin = sin_emb[..., 0::2]
+        output = ops.stack(
+            (even * cos - odd * sin, odd * cos + even * sin), axis=-1
         )
-        seq_len = ops.shape(x)[self.sequence_axis]
-        tensor = ops.arange(seq_len, dtype="float32")
-        tensor = ops.cast(tensor, dtype=inverse_freq.dtype)
-        freq = ops.einsum("i, j -> ij", tensor, inverse_freq)
-        embedding = ops.concatenate((freq, freq), axis=self.feature_axis)
+        return ops.reshape(output, ops.shape(tensor))
 
-        def get_axis(axis):
-            return axis if axis > 0 else len(x.shape) + axis
+    def _get_inverse_freq(self, rotary_dim):
+        # Compute in float32 and cast to `compute_dtype` once at the end, so
+        # the `pow` and reciprocal run once at full precision rather than on
+        # every forward pass in a low precision dtype.
+        freq_range = ops.arange(0, rotary_dim, 2, dtype="float32")
+        scale = ops.cast(rotary_dim, "float32") * self.scaling_factor
+        inverse_freq = 1.0 / (self.max_wavelength ** (freq_range / scale))
+        return ops.cast(inverse_freq, self.compute_dtype)
+
+    def _compute_cos_sin_embedding(self, x, rotary_dim):
+        seq_len = ops.shape(x)[self._sequence_axis]
+        cos_emb, sin_emb = self._compute_cos_sin_tables(x, seq_len, rotary_dim)
+        # A single reshape broadcasts the embeddings to the input rank in
+        # one op, instead of one `expand_dims` per remaining axis.
+        broadcast_shape = [1] * self._rank
+        broadcast_shape[self._sequence_axis] = seq_len
+        broadcast_shape[self._feature_axis] = rotary_dim
+        cos_emb = ops.reshape(cos_emb, broadcast_shape)
+        sin_emb = ops.reshape(sin_emb, broadcast_shape)
 
-        feature_axis = get_axis(self.feature_axis)
-        sequence_axis = get_axis(self.sequence_axis)
+        return cos_emb, sin_emb
 
-        for axis in range(len(x.shape)):
-            if axis != sequence_axis and axis != feature_axis:
-                embedding = ops.expand_dims(embedding, axis)
+    def _compute_cos_sin_tables(self, x, seq_len, rotary_dim):
+        if self.cos_cache is not None:
+            static_seq_len = x.shape[self._sequence_axis]
+            if (
+                static_seq_len is not None
+                and static_seq_len > self.max_sequence_length
+            ):
+                raise ValueError(
+                    "Inputs may not be longer than `max_sequence_length` "
+                    "when precomputed rotary tables are in use. Received: "
+                    f"an input of sequence length {static_seq_len} with "
+                    f"max_sequence_length={self.max_sequence_length}"
+                )
+            cos_emb = ops.cast(self.cos_cache[:seq_len, :], self.compute_dtype)
+            sin_emb = ops.cast(self.sin_cache[:seq_len, :], self.compute_dtype)
+        else:
+            inverse_freq = self.inverse_freq
+            if inverse_freq is None:
+                inverse_freq = self._get_inverse_freq(rotary_dim)
+            positions = ops.arange(seq_len, dtype="float32")
+            positions = ops.cast(positions, dtype=inverse_freq.dtype)
+            # An outer product via broadcasting is faster than the equivalent
+            # `ops.einsum("i, j -> ij", ...)` call.
+            freq = ops.expand_dims(positions, -1) * ops.expand_dims(
+                inverse_freq, 0
+            )
+            embedding = self._duplicate_freq(freq)
+            cos_emb = ops.cos(embedding)
+            sin_emb = ops.sin(embedding)
 
-        return ops.cos(embedding), ops.sin(embedding)
+        return cos_emb, sin_emb
 
     def get_config(self):
         config = super().get_config()
@@ -120,6 +360,9 @@ class RotaryEmbedding(keras.layers.Layer):
                 "scaling_factor": self.scaling_factor,
                 "sequence_axis": self.sequence_axis,
                 "feature_axis": self.feature_axis,
+                "max_sequence_length": self.max_sequence_length,
+                "pair_layout": self.pair_layout,
+                "jit_compile": self.jit_compile,
             }
         )
         return config
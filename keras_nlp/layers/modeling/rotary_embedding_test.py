@@ -11,8 +11,11 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import pytest
+
 from keras_nlp.backend import keras
 from keras_nlp.backend import ops
+from keras_nlp.layers.modeling import _rope_kernels
 from keras_nlp.layers.modeling.rotary_embedding import RotaryEmbedding
 from keras_nlp.tests.test_case import TestCase
 
@@ -65,6 +68,21 @@ class RotaryEmbeddingTest(TestCase):
         expected_output_shape = (None, None, seq_length, hidden_size)
         self.assertEqual(expected_output_shape, outputs.shape)
 
+    def test_mixed_rank_inputs_on_one_instance(self):
+        embedding_layer = RotaryEmbedding()
+        rank_3_input = ops.reshape(ops.arange(48, dtype="float32"), (2, 4, 6))
+        rank_4_input = ops.reshape(
+            ops.arange(96, dtype="float32"), (2, 4, 2, 6)
+        )
+
+        # One instance may be called on inputs both with and without a heads
+        # axis; each call should match a layer built for that rank alone.
+        rank_3_output = embedding_layer(rank_3_input)
+        rank_4_output = embedding_layer(rank_4_input)
+        self.assertAllClose(rank_3_output, RotaryEmbedding()(rank_3_input))
+        self.assertAllClose(rank_4_output, RotaryEmbedding()(rank_4_input))
+        self.assertAllClose(embedding_layer(rank_3_input), rank_3_output)
+
     def test_output_correct_values(self):
         embedding_layer = RotaryEmbedding()
         model = keras.Sequential(
@@ -82,6 +100,70 @@ class RotaryEmbeddingTest(TestCase):
         self.assertAllClose(output[0, 0, :], expected_0, atol=0.01, rtol=0.01)
         self.assertAllClose(output[0, 3, :], expected_3, atol=0.01, rtol=0.01)
 
+    def test_cached_cos_sin_tables_match_on_the_fly_compute(self):
+        input = ops.ones(shape=[2, 4, 6])
+        output = RotaryEmbedding()(input)
+        cached_output = RotaryEmbedding(max_sequence_length=8)(input)
+
+        # Precomputed tables should match on-the-fly computation, up to the
+        # bfloat16 precision the tables are stored at.
+        self.assertAllClose(output, cached_output, atol=0.01, rtol=0.01)
+
+    def test_jit_compiled_call(self):
+        input = ops.ones(shape=[2, 4, 6])
+        output = RotaryEmbedding(jit_compile=True)(input)
+
+        # The flag is a no-op outside the TensorFlow backend; either way the
+        # output should match the uncompiled path.
+        self.assertAllClose(output, RotaryEmbedding()(input))
+
+    def test_sequence_longer_than_max_sequence_length_error(self):
+        embedding_layer = RotaryEmbedding(max_sequence_length=2)
+        with self.assertRaises(ValueError):
+            embedding_layer(ops.ones(shape=[2, 4, 6]))
+
+    def test_layers_share_rotary_tables(self):
+        first = RotaryEmbedding(max_sequence_length=8)
+        second = RotaryEmbedding(max_sequence_length=8)
+        first.build((2, 4, 6))
+        second.build((2, 4, 6))
+
+        # Identically configured layers should share one set of tables.
+        self.assertIs(first.inverse_freq, second.inverse_freq)
+        self.assertIs(first.cos_cache, second.cos_cache)
+        self.assertIs(first.sin_cache, second.sin_cache)
+
+    @pytest.mark.skipif(
+        not _rope_kernels.available(),
+        reason="requires the numba package",
+    )
+    def test_numba_kernel_matches_ops_path(self):
+        input = ops.reshape(ops.arange(96, dtype="float32"), (2, 4, 2, 6))
+        embedding_layer = RotaryEmbedding()
+        expected = embedding_layer(input)
+
+        cos_emb, sin_emb = embedding_layer._compute_cos_sin_embedding(input, 6)
+        output = _rope_kernels.apply_rotary_pos_emb(
+            ops.convert_to_numpy(input),
+            ops.convert_to_numpy(cos_emb),
+            ops.convert_to_numpy(sin_emb),
+        )
+        self.assertAllClose(output, expected)
+
+    def test_interleave_pair_layout(self):
+        input = ops.reshape(ops.arange(48, dtype="float32"), (2, 4, 6))
+        output = RotaryEmbedding(pair_layout="interleave")(input)
+
+        # The interleaved variant pairs adjacent features; permuting even
+        # features ahead of odd features maps it onto the "half" layout.
+        perm = [0, 2, 4, 1, 3, 5]
+        expected = RotaryEmbedding()(ops.take(input, perm, axis=-1))
+        self.assertAllClose(ops.take(output, perm, axis=-1), expected)
+
+    def test_invalid_pair_layout(self):
+        with self.assertRaises(ValueError):
+            RotaryEmbedding(pair_layout="full")
+
     def test_get_config_and_from_config(self):
         embedding_layer = RotaryEmbedding(
             max_wavelength=1000,
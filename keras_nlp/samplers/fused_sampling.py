@@ -0,0 +1,80 @@
+# Copyright 2023 The KerasNLP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Optional fused CUDA sampling ops for samplers.
+
+Sampling frameworks with dedicated CUDA kernels fuse the top-k filter,
+softmax and categorical draw into a single launch, which is substantially
+faster than running them op by op for large vocabularies. This module loads
+such a kernel from a user-built custom op library, so it can be used without
+making CUDA toolchains a build dependency of KerasNLP.
+
+To enable it, build a TensorFlow custom op library exposing a `FusedTopP`
+op with signature `fused_top_p(logits, p, k, seed) -> next_token` and point
+the `KERAS_NLP_FUSED_SAMPLING_LIBRARY` environment variable at the shared
+object. Samplers fall back to pure backend ops when the library is absent.
+"""
+
+import os
+
+from keras_nlp.backend import config
+
+_LIBRARY_ENV_VAR = "KERAS_NLP_FUSED_SAMPLING_LIBRARY"
+
+_library = None
+_library_load_failed = False
+
+
+def _load_library():
+    global _library, _library_load_failed
+    if _library is not None or _library_load_failed:
+        return _library
+    path = os.environ.get(_LIBRARY_ENV_VAR)
+    if not path:
+        _library_load_failed = True
+        return None
+    import tensorflow as tf
+
+    try:
+        _library = tf.load_op_library(path)
+    except (tf.errors.NotFoundError, OSError):
+        _library_load_failed = True
+    return _library
+
+
+def fused_top_p_available():
+    """Check if a fused top-p sampling kernel can be used."""
+    if config.backend() != "tensorflow":
+        return False
+    import tensorflow as tf
+
+    if not tf.config.list_physical_devices("GPU"):
+        return False
+    library = _load_library()
+    return library is not None and hasattr(library, "fused_top_p")
+
+
+def fused_top_p(logits, p, k, seed):
+    """Sample the next token with a single fused top-k + top-p kernel.
+
+    Args:
+        logits: a Tensor of shape `(batch_size, vocab_size)`, the
+            temperature scaled logits for the next token.
+        p: float, the `p` value of top-p.
+        k: int, the top-k cutoff applied before top-p, or `0` to filter by
+            `p` alone.
+        seed: an integer seed state tensor for the draw, as produced by
+            `keras_nlp.backend.random.SeedGenerator.next()`. Callers must
+            pass a fresh state per draw, since the kernel is stateless.
+    """
+    return _load_library().fused_top_p(logits=logits, p=p, k=k, seed=seed)
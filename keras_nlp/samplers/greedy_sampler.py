@@ -60,5 +60,5 @@ class GreedySampler(Sampler):
     ):
         super().__init__(**kwargs)
 
-    def get_next_token(self, probabilities):
+    def get_next_token(self, probabilities, logits=None, index=None):
         return ops.argmax(probabilities, axis=-1)
@@ -68,7 +68,7 @@ class RandomSampler(Sampler):
         self.seed = seed
         self.seed_generator = random.SeedGenerator(seed)
 
-    def get_next_token(self, probabilities):
+    def get_next_token(self, probabilities, logits=None, index=None):
         # Sample the next token from the probability distribution.
         next_token_id = random.categorical(
             ops.log(probabilities),
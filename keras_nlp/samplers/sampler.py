@@ -144,9 +144,12 @@ class Sampler:
         def body(prompt, cache, index):
             # Compute the softmax distribution for the next token.
             logits, _, cache = next(prompt, cache, index)
-            probabilities = keras.activations.softmax(logits / self.temperature)
+            logits = logits / self.temperature
+            probabilities = keras.activations.softmax(logits)
             # Compute the next token.
-            next_token = self.get_next_token(probabilities)
+            next_token = self.get_next_token(
+                probabilities, logits=logits, index=index
+            )
             # Don't overwrite anywhere mask is True.
             next_token = ops.cast(next_token, prompt.dtype)
             # Ensure shape is `[None]`, otherwise it causes issues after
@@ -160,6 +163,11 @@ class Sampler:
             # Return the next prompt, cache and incremented index.
             return (prompt, cache, index + 1)
 
+        # Give samplers a chance to pre-draw per-step randomness before
+        # entering the decoding loop.
+        static_shape = prompt.shape
+        self._prepare_keys(static_shape[-1], static_shape[0])
+
         prompt, _, _ = self.run_loop(
             cond,
             body,
@@ -203,11 +211,28 @@ class Sampler:
             )
         return loop_vars
 
-    def get_next_token(self, probabilities):
+    def _prepare_keys(self, n_steps, batch_size):
+        """Pre-draw per-step randomness before the generation loop.
+
+        Subclasses that consume randomness at every step can override this
+        to draw it for all steps at once, indexed by the `index` argument of
+        `get_next_token`, which avoids updating seed state inside the
+        compiled decoding loop. Either argument may be `None` when the
+        corresponding dimension is not statically known.
+        """
+        pass
+
+    def get_next_token(self, probabilities, logits=None, index=None):
         """Get the next token.
         Args:
             probabilities: a Tensor, the probability distribution for next
                 token over all vocab tokens.
+            logits: a Tensor, the temperature scaled logits the probability
+                distribution was computed from, if available. Samplers can
+                use these to avoid recomputing log-probabilities.
+            index: int, the index of the prompt column being sampled, if
+                called from the generation loop. Samplers can use this to
+                look up randomness pre-drawn by `_prepare_keys`.
         Get the next token based on given probability distribution over tokens.
         Subclasses must implement this method.
         """
@@ -71,7 +71,7 @@ class TopKSampler(Sampler):
         self.seed = seed
         self.seed_generator = random.SeedGenerator(seed)
 
-    def get_next_token(self, probabilities):
+    def get_next_token(self, probabilities, logits=None, index=None):
         # Filter out top-k tokens.
         top_k_pred, top_k_indices = ops.top_k(
             probabilities,
@@ -16,10 +16,22 @@
 from keras_nlp.api_export import keras_nlp_export
 from keras_nlp.backend import ops
 from keras_nlp.backend import random
+from keras_nlp.samplers import fused_sampling
 from keras_nlp.samplers.sampler import Sampler
 from keras_nlp.samplers.sampler import call_args_docstring
 from keras_nlp.utils.python_utils import format_docstring
 
+# Vocabulary size at which a full sort switches from `ops.top_k` to
+# `ops.argsort`. With no top-k cutoff, backends lower `argsort` to a
+# device-wide radix sort, which beats the selection in `top_k` once the
+# vocabulary gets large.
+_ARGSORT_VOCAB_SIZE = 100_000
+
+# Number of bisection steps used to locate the nucleus probability cutoff
+# with the `"reject"` strategy. Each step halves the cutoff search interval,
+# so 16 steps locate the cutoff to within ~2^-16 of the top probability.
+_PIVOT_SEARCH_ITERATIONS = 16
+
 
 @format_docstring(call_args=call_args_docstring)
 @keras_nlp_export("keras_nlp.samplers.TopPSampler")
@@ -34,13 +46,21 @@ class TopPSampler(Sampler):
 
     Args:
         p: float, the `p` value of top-p.
-        k: int. If set, this argument defines a
+        k: int. This argument defines a
             heuristic "top-k" cutoff applied before the "top-p" sampling. All
             logits not in the top `k` will be discarded, and the remaining
             logits will be sorted to find a cutoff point for `p`. Setting this
             arg can significantly speed sampling up by reducing the number
-            of tokens to sort. Defaults to `None`.
+            of tokens to sort. For realistic `p` values the nucleus holds far
+            fewer tokens than the default cutoff, so the default behaves like
+            exact top-p sampling. Set to `None` to sort the full vocabulary
+            for every sample. Defaults to `256`.
         seed: int. The random seed. Defaults to `None`.
+        strategy: str. Either `"sort"` or `"reject"`. `"sort"` sorts the
+            (optionally top-k filtered) probabilities to find the nucleus.
+            `"reject"` instead locates the nucleus probability cutoff with a
+            bounded bisection search, avoiding the sort entirely, which is
+            usually faster for large vocabularies. Defaults to `"sort"`.
 
     Call arguments:
         {{call_args}}
@@ -71,46 +91,145 @@ class TopPSampler(Sampler):
     def __init__(
         self,
         p=0.1,
-        k=None,
+        k=256,
         seed=None,
+        strategy="sort",
         **kwargs,
     ):
         super().__init__(**kwargs)
+        if strategy not in ("sort", "reject"):
+            raise ValueError(
+                '`strategy` must be either `"sort"` or `"reject"`. '
+                f"Received: strategy={strategy}"
+            )
         self.p = p
         self.k = k
         self.seed = seed
+        self.strategy = strategy
         self.seed_generator = random.SeedGenerator(seed)
+        self._gumbel_noise = None
+
+    def _prepare_keys(self, n_steps, batch_size):
+        self._gumbel_noise = None
+        if self.strategy != "sort" or self.k is None:
+            return
+        if fused_sampling.fused_top_p_available():
+            # The fused kernel draws its own randomness.
+            return
+        if not isinstance(n_steps, int) or not isinstance(batch_size, int):
+            # Shapes are not statically known; noise is drawn per step.
+            return
+        # Draw the Gumbel noise for every decoding step up front, so no
+        # seed state needs updating inside the compiled decoding loop.
+        uniform_noise = random.uniform(
+            (n_steps, batch_size, self.k), seed=self.seed_generator
+        )
+        self._gumbel_noise = -ops.log(-ops.log(uniform_noise))
 
-    def get_next_token(self, probabilities):
+    def get_next_token(self, probabilities, logits=None, index=None):
+        if logits is not None and fused_sampling.fused_top_p_available():
+            # When a custom op library with a fused top-k + top-p + sample
+            # CUDA kernel is provided, the whole filter and draw runs in a
+            # single kernel launch. Each step draws a fresh seed state, so
+            # the stateless kernel stays independent across steps.
+            return fused_sampling.fused_top_p(
+                logits, self.p, self.k or 0, self.seed_generator.next()
+            )
+        if self.strategy == "reject":
+            return self._sample_with_rejection(probabilities)
         cutoff = ops.shape(probabilities)[1]
         if self.k is not None:
-            # If `k` is set, only sample from top `k` tokens.
-            cutoff = self.k
-        sorted_preds, sorted_indices = ops.top_k(
-            probabilities, k=cutoff, sorted=True
-        )
-        # Calculate cumulative probability distribution.
+            # If `k` is set, only sample from top `k` tokens. The cutoff
+            # should never exceed the vocabulary size.
+            if isinstance(cutoff, int):
+                cutoff = min(cutoff, self.k)
+            else:
+                cutoff = ops.minimum(cutoff, self.k)
+        # When logits are available, rank and sample in logit space; the
+        # masked logits can feed the final draw directly, skipping the `log`
+        # of already-softmaxed probabilities below.
+        ranked = logits if logits is not None else probabilities
+        if (
+            self.k is None
+            and isinstance(cutoff, int)
+            and cutoff >= _ARGSORT_VOCAB_SIZE
+        ):
+            sorted_indices = ops.argsort(-ranked, axis=-1)
+            sorted_ranked = ops.take_along_axis(ranked, sorted_indices, axis=-1)
+        else:
+            sorted_ranked, sorted_indices = ops.top_k(
+                ranked, k=cutoff, sorted=True
+            )
+        if logits is not None:
+            sorted_logits = sorted_ranked
+            sorted_preds = ops.take_along_axis(
+                probabilities, sorted_indices, axis=-1
+            )
+        else:
+            sorted_preds = sorted_ranked
+        # Keep a token if the cumulative probability of all higher ranked
+        # tokens is within `p`. Subtracting `sorted_preds` gives an exclusive
+        # prefix sum, so this keeps the token that crosses `p` and always
+        # keeps the top token, without a concatenate-and-shift of the mask.
         cumulative_probabilities = ops.cumsum(sorted_preds, axis=-1)
-        # Create a mask for the tokens to keep.
-        keep_mask = cumulative_probabilities <= self.p
-        # Shift to include the last token that exceed p.
-        shifted_keep_mask = ops.concatenate(
-            [ops.ones_like(keep_mask[:, :1]), keep_mask[:, :-1]], axis=-1
-        )
-        # Filter out unmasked tokens and sample from filtered distribution.
-        probabilities = ops.where(
-            shifted_keep_mask,
-            sorted_preds,
-            ops.zeros(ops.shape(sorted_preds), dtype=sorted_preds.dtype),
-        )
-        sorted_next_token = random.categorical(
+        keep_mask = cumulative_probabilities - sorted_preds <= self.p
+        # Mask and take the log in a single op. Masked tokens get a large
+        # negative log-probability directly, which avoids materializing a
+        # zeros tensor just to take `log(0)` on it.
+        if logits is not None:
+            log_probs = ops.where(keep_mask, sorted_logits, -1e9)
+        else:
+            log_probs = ops.where(keep_mask, ops.log(sorted_preds), -1e9)
+        # Sample with the Gumbel-max trick. Adding Gumbel noise to the masked
+        # log-probabilities and taking the argmax draws from the same
+        # distribution as `random.categorical`, but costs one uniform draw
+        # and one argmax instead of an internal cumsum and search.
+        if index is not None and self._gumbel_noise is not None:
+            # Reuse the noise pre-drawn for this step by `_prepare_keys`.
+            gumbel_noise = ops.cast(
+                self._gumbel_noise[index][:, :cutoff], log_probs.dtype
+            )
+        else:
+            uniform_noise = random.uniform(
+                ops.shape(log_probs),
+                dtype=log_probs.dtype,
+                seed=self.seed_generator,
+            )
+            gumbel_noise = -ops.log(-ops.log(uniform_noise))
+        sorted_next_token = ops.argmax(log_probs + gumbel_noise, axis=-1)
+        # Map the nucleus-relative choice back to a vocabulary id with a
+        # single batched gather. `take_along_axis` lowers `(batch, 1)`
+        # indices to one `gather` with batch dims on the TensorFlow backend,
+        # and indexing out the only column avoids a separate squeeze kernel.
+        return ops.take_along_axis(
+            sorted_indices, sorted_next_token[:, None], axis=-1
+        )[:, 0]
+
+    def _sample_with_rejection(self, probabilities):
+        # Bisect for the smallest probability still inside the nucleus. Each
+        # step costs a masked reduction over the distribution, which is much
+        # cheaper than sorting the vocabulary. The invariant is that tokens
+        # with probability `>= lower` always hold more than `p` total mass.
+        lower = ops.zeros_like(probabilities[:, 0])
+        upper = ops.max(probabilities, axis=-1)
+        for _ in range(_PIVOT_SEARCH_ITERATIONS):
+            pivot = ops.expand_dims((lower + upper) / 2, -1)
+            nucleus_mass = ops.sum(
+                ops.where(probabilities >= pivot, probabilities, 0.0),
+                axis=-1,
+            )
+            in_nucleus = nucleus_mass > self.p
+            lower = ops.where(in_nucleus, pivot[:, 0], lower)
+            upper = ops.where(in_nucleus, upper, pivot[:, 0])
+        keep_mask = probabilities >= ops.expand_dims(lower, -1)
+        probabilities = ops.where(keep_mask, probabilities, 0.0)
+        next_token = random.categorical(
             ops.log(probabilities),
             1,
             seed=self.seed_generator,
             dtype="int32",
         )
-        output = ops.take_along_axis(sorted_indices, sorted_next_token, axis=-1)
-        return ops.squeeze(output, axis=-1)
+        return ops.squeeze(next_token, axis=-1)
 
     def get_config(self):
         config = super().get_config()
@@ -119,6 +238,7 @@ class TopPSampler(Sampler):
                 "p": self.p,
                 "k": self.k,
                 "seed": self.seed,
+                "strategy": self.strategy,
             }
         )
         return config
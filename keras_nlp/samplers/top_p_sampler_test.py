@@ -13,12 +13,15 @@
 # limitations under the License.
 """Tests for Top-P sampler."""
 
+from unittest.mock import patch
+
 import numpy as np
 import pytest
 import tensorflow as tf
 from absl.testing import parameterized
 
 from keras_nlp.backend import ops
+from keras_nlp.samplers import fused_sampling
 from keras_nlp.samplers.top_p_sampler import TopPSampler
 from keras_nlp.tests.test_case import TestCase
 
@@ -127,6 +130,78 @@ class TopPSamplerTest(TestCase):
         output_ids = set(ops.convert_to_numpy(output[0]))
         self.assertContainsSubset(output_ids, range(3))
 
+    def test_default_k_matches_exact_top_p(self):
+        probs = np.full((self.vocab_size,), 0.05 / 22)
+        probs[:4] = [0.5, 0.2, 0.15, 0.1]
+
+        def next(prompt, cache, index):
+            # Dummy hidden states.
+            hidden_states = ops.ones([self.batch_size, 5])
+            logits = np.repeat(np.log(probs)[None, :], self.batch_size, axis=0)
+            return ops.array(logits), hidden_states, cache
+
+        prompt = ops.full((self.batch_size, self.length), self.char_lookup["z"])
+        # The default `k` is larger than the vocabulary, so sampling should
+        # match exact top-p, which keeps the first four tokens for `p=0.9`.
+        output = TopPSampler(p=0.9)(
+            next=next,
+            prompt=prompt,
+        )
+        output_ids = set(ops.convert_to_numpy(output[0]))
+        self.assertContainsSubset(output_ids, range(4))
+
+    def test_rejection_strategy_stateful_call(self):
+        cache_chars = list("sequentially")
+        cache = ops.array([[self.char_lookup[c] for c in cache_chars]])
+        prompt = ops.full((self.batch_size, self.length), self.char_lookup["z"])
+        output = TopPSampler(p=0.1, strategy="reject")(
+            next=self.next,
+            prompt=prompt,
+            cache=cache,
+        )
+        self.assertEqual(self.join_as_string(output), ["sequentially"])
+
+    def test_rejection_strategy_outputs_in_top_p(self):
+        def next(prompt, cache, index):
+            # Dummy hidden states.
+            hidden_states = ops.ones([self.batch_size, 5])
+            logits = np.zeros((self.batch_size, self.vocab_size))
+            logits[:, :3] = 1.0
+            return ops.array(logits), hidden_states, cache
+
+        prompt = ops.full((self.batch_size, self.length), self.char_lookup["z"])
+        output = TopPSampler(p=(2.0 / self.vocab_size), strategy="reject")(
+            next=next,
+            prompt=prompt,
+        )
+        output_ids = set(ops.convert_to_numpy(output[0]))
+        self.assertContainsSubset(output_ids, range(3))
+
+    def test_fused_kernel_dispatch(self):
+        sampler = TopPSampler(p=0.5, k=5)
+        logits = ops.ones((self.batch_size, self.vocab_size))
+        probabilities = ops.softmax(logits)
+        fused_output = ops.zeros([self.batch_size], dtype="int32")
+
+        with patch.object(
+            fused_sampling, "fused_top_p_available", return_value=True
+        ):
+            with patch.object(
+                fused_sampling, "fused_top_p", return_value=fused_output
+            ) as fused_op:
+                output = sampler.get_next_token(probabilities, logits=logits)
+
+        passed_logits, p, k, seed = fused_op.call_args.args
+        self.assertIs(passed_logits, logits)
+        self.assertEqual(p, 0.5)
+        self.assertEqual(k, 5)
+        self.assertIsNotNone(seed)
+        self.assertAllEqual(output, fused_output)
+
+    def test_invalid_strategy(self):
+        with self.assertRaises(ValueError):
+            TopPSampler(p=0.1, strategy="radix")
+
     def test_temperature(self):
         def next(prompt, cache, index):
             # Dummy hidden states.